@@ -1,6 +1,19 @@
 import os
+import glob
+import json
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+import numpy as np
 import pandas as pd
-from bokeh.io import output_file, show
+try:
+    import fcntl
+except ImportError:
+    # Windows has no fcntl; cache rebuilds there are not serialised between processes
+    fcntl = None
+from bokeh.io import curdoc, output_file, show
 from bokeh.layouts import column, row
 from bokeh.models import (
     Div,
@@ -12,7 +25,9 @@ from bokeh.models import (
     Button,
     CustomJS,
     Checkbox,
-    CustomJSFilter,
+    IndexFilter,
+    Range1d,
+    DataRange1d,
     CDSView,
     Select,
     AutocompleteInput,
@@ -20,6 +35,7 @@ from bokeh.models import (
     DateFormatter,
     HoverTool
 )
+from bokeh.events import RangesUpdate, Reset
 from bokeh.themes import Theme
 from bokeh.plotting import figure
 
@@ -86,12 +102,144 @@ function getcsv(source, file) {
 }
 """
 
+# JavaScript for Faceted Filter Counts
+FacetCountsJavaScript = """
+function facetCounts(codes, dictionaries, allowed, row_allowed) {
+    // codes[d][i] is the dictionary code of row i in facet d (-1 when missing)
+    // allowed[d] flags the permitted codes of facet d, or is null when facet d is unfiltered
+    const ndims = codes.length;
+    const nrows = ndims > 0 ? codes[0].length : 0;
+    const counts = dictionaries.map(dictionary => new Array(dictionary.length).fill(0));
+    const indices = [];
+
+    for (let i = 0; i < nrows; i++) {
+        if (!row_allowed(i)) {
+            continue;
+        }
+
+        // A row failing exactly one facet still counts towards that facet's options
+        let failures = 0;
+        let failed = -1;
+        for (let d = 0; d < ndims && failures < 2; d++) {
+            const code = codes[d][i];
+            if (allowed[d] !== null && (code < 0 || !allowed[d][code])) {
+                failures++;
+                failed = d;
+            }
+        }
+
+        if (failures === 0) {
+            indices.push(i);
+            for (let d = 0; d < ndims; d++) {
+                if (codes[d][i] >= 0) {
+                    counts[d][codes[d][i]]++;
+                }
+            }
+        } else if (failures === 1 && codes[failed][i] >= 0) {
+            counts[failed][codes[failed][i]]++;
+        }
+    }
+
+    return {indices: indices, counts: counts};
+}
+
+function facetOptions(dictionary, counts, selected) {
+    const options = [];
+    let total = 0;
+    for (let code = 0; code < dictionary.length; code++) {
+        total += counts[code];
+        if (counts[code] > 0 || dictionary[code] === selected) {
+            options.push([dictionary[code], dictionary[code] + ' (' + counts[code] + ')']);
+        }
+    }
+    return [['All', 'All (' + total + ')']].concat(options);
+}
+"""
+
+# JavaScript for Line Chart Downsampling
+LineDownsampleJavaScript = """
+function lttbIndices(x, y, threshold) {
+    // Mirrors lttb_indices: first and last points are kept, interior points split into threshold - 2 buckets
+    const n = x.length;
+    if (threshold < 3 || n <= threshold) {
+        return Array.from({length: n}, (_, i) => i);
+    }
+
+    // Bucket edges as numpy.linspace(1, n - 1, threshold - 1) truncated to integers
+    const step = (n - 2) / (threshold - 2);
+    const edges = [];
+    for (let i = 0; i < threshold - 1; i++) {
+        edges.push(i === threshold - 2 ? n - 1 : Math.floor(i * step + 1));
+    }
+    const indices = [0];
+    let selected = 0;
+
+    for (let i = 0; i < threshold - 2; i++) {
+        const start = edges[i];
+        const end = edges[i + 1];
+        const next_start = i + 2 < edges.length ? edges[i + 1] : n - 1;
+        const next_end = i + 2 < edges.length ? edges[i + 2] : n;
+        let next_x = 0;
+        let next_y = 0;
+        for (let j = next_start; j < next_end; j++) {
+            next_x += x[j];
+            next_y += y[j];
+        }
+        next_x /= next_end - next_start;
+        next_y /= next_end - next_start;
+
+        // Keep the point forming the largest triangle with the previous pick and the next bucket average
+        let best = start;
+        let best_area = -1;
+        for (let j = start; j < end; j++) {
+            const area = Math.abs(
+                (x[selected] - next_x) * (y[j] - y[selected]) - (x[selected] - x[j]) * (next_y - y[selected])
+            );
+            if (area > best_area) {
+                best_area = area;
+                best = j;
+            }
+        }
+        selected = best;
+        indices.push(selected);
+    }
+
+    indices.push(n - 1);
+    return indices;
+}
+
+function searchSorted(x, value, right) {
+    // First index whose value is >= value (or > value when right is set), like numpy.searchsorted
+    let low = 0;
+    let high = x.length;
+    while (low < high) {
+        const middle = (low + high) >> 1;
+        if (x[middle] < value || (right && x[middle] === value)) {
+            low = middle + 1;
+        } else {
+            high = middle;
+        }
+    }
+    return low;
+}
+"""
+
+# ============================
+# Detect Server Mode
+# ============================
+
+# When launched with `bokeh serve dashboard.py` the document belongs to a server session
+SERVER_MODE = curdoc().session_context is not None
+
 # ============================
 # Verify and Create Output Directory
 # ============================
 
 output_directory = 'data/output'
 output_html_path = os.path.join(output_directory, 'Dashboard.html')
+aggregates_directory = os.path.join(output_directory, 'aggregates')
+input_directory = 'data/input'
+columnar_directory = os.path.join(output_directory, 'columnar')
 
 if not os.path.exists(output_directory):
     try:
@@ -168,42 +316,725 @@ custom_theme = Theme(json={
 })
 
 # ============================
-# TAB 0: Summary
+# Ingest Helpers
 # ============================
 
-try:
-    print("Loading BFIPublicDataDF...")
-    # Path to the data
-    output_file_path = 'data/input/tabula-bfi-payments-over-25000-report-2014-15.csv'
+# Columns identifying a transaction across overlapping spend reports
+DUPLICATE_KEY_COLUMNS = ['Transaction Ref', 'Date', 'Supplier', 'Amount']
+
+# Bumped whenever row_hashes changes, so indexes persisted with the old hashing are rebuilt
+DUPLICATE_INDEX_VERSION = 2
 
-    # Load the data
-    BFIPublicDataDF = pd.read_csv(output_file_path)
-    print("BFIPublicDataDF loaded successfully:")
-    print(BFIPublicDataDF.head())
+# Drop duplicate rows, or keep them in the Data tab with a 'Duplicate' flag and leave them out of totals
+DROP_DUPLICATES = True
+
+
+def source_fingerprint(path):
+    """Identify a version of an input file by its size and modification time."""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def write_atomically(path, write, mode='w'):
+    """Write a file through a temporary sibling and swap it in, so readers never see a partial file."""
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, mode) as temporary_file:
+        write(temporary_file)
+    os.replace(temporary_path, path)
+
+
+def load_spend_report(path):
+    """Load one spend report CSV and clean its Date, Month and Amount columns."""
+    df = pd.read_csv(path)
 
     # Convert data types
-    BFIPublicDataDF = BFIPublicDataDF.convert_dtypes(convert_string=True)
+    df = df.convert_dtypes(convert_string=True)
 
     # Specify the date format based on your data
-    print("Parsing Dates in BFIPublicDataDF...")
-    BFIPublicDataDF['Date'] = pd.to_datetime(
-        BFIPublicDataDF['Date'], 
-        format="%d/%m/%y",
-        errors='coerce'
-    )
-    BFIPublicDataDF['Month'] = BFIPublicDataDF['Date'].dt.strftime('%B %Y')
-    print("Month extraction complete:")
-    print(BFIPublicDataDF[['Date', 'Month']].head())
-
-    # Clean and convert 'Amount' to numeric in Summary Tab
-    print("Cleaning and converting 'Amount' column to numeric in Summary Tab...")
-    BFIPublicDataDF['Amount'] = BFIPublicDataDF['Amount'].replace({'£': '', ',': ''}, regex=True)
-    BFIPublicDataDF['Amount'] = pd.to_numeric(BFIPublicDataDF['Amount'], errors='coerce').fillna(0.0)
-    print("After cleaning, 'Amount' column in Summary Tab:")
-    print(BFIPublicDataDF['Amount'].head())
+    df['Date'] = pd.to_datetime(df['Date'], format="%d/%m/%y", errors='coerce')
+    df['Month'] = df['Date'].dt.strftime('%B %Y')
+
+    # Clean and convert 'Amount' to numeric
+    df['Amount'] = df['Amount'].replace({'£': '', ',': ''}, regex=True)
+    df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce').fillna(0.0)
+    return df
+
+
+def row_hashes(df):
+    """Hash each row's duplicate key columns to a uint64, independent of the dtypes inferred per report."""
+    keys = pd.DataFrame({
+        'Transaction Ref': df['Transaction Ref'].astype('string').str.strip().fillna('').astype(object),
+        'Date': pd.to_datetime(df['Date']).astype('datetime64[ns]'),
+        'Supplier': df['Supplier'].astype('string').str.strip().fillna('').astype(object),
+        'Amount': pd.to_numeric(df['Amount']).astype('float64').round(2)
+    })
+    return pd.util.hash_pandas_object(keys[DUPLICATE_KEY_COLUMNS], index=False).to_numpy()
+
+
+def load_duplicate_index(directory):
+    """Load the persisted row hash index, the owning source of each hash and the indexed sources."""
+    manifest_path = os.path.join(directory, 'duplicate_manifest.json')
+    empty_manifest = {'version': DUPLICATE_INDEX_VERSION, 'sources': [], 'fingerprints': {}}
+    if not os.path.exists(manifest_path):
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int32), empty_manifest
+
+    with open(manifest_path) as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest.get('version') != DUPLICATE_INDEX_VERSION:
+        print("Duplicate index was built with older key hashing, rebuilding...")
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int32), empty_manifest
+    with np.load(os.path.join(directory, 'duplicate_index.npz')) as index_file:
+        return index_file['hashes'], index_file['owners'], manifest
+
+
+def save_duplicate_index(directory, hashes, owners, manifest):
+    """Persist the row hash index next to a manifest of the sources it covers."""
+    os.makedirs(directory, exist_ok=True)
+    write_atomically(
+        os.path.join(directory, 'duplicate_index.npz'),
+        lambda index_file: np.savez(index_file, hashes=hashes, owners=owners),
+        mode='wb'
+    )
+    write_atomically(
+        os.path.join(directory, 'duplicate_manifest.json'),
+        lambda manifest_file: json.dump(manifest, manifest_file, indent=2)
+    )
+
+
+def find_duplicates(directory, frames_by_source):
+    """Flag rows already seen in an earlier row or report, checking only new reports against the index."""
+    hashes, owners, manifest = load_duplicate_index(directory)
+    current = {source: source_fingerprint(source) for source in frames_by_source}
+
+    # Appending reports is incremental; if an indexed report changed or went missing, or a new report
+    # sorts before an indexed one, re-index everything so the first report in load order keeps each row
+    indexed = manifest['sources']
+    load_order = list(frames_by_source)
+    if (any(current.get(source) != manifest['fingerprints'].get(source) for source in indexed)
+            or load_order[:len(indexed)] != indexed):
+        print("Indexed spend reports changed, rebuilding duplicate index...")
+        hashes, owners = np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int32)
+        manifest = {'version': DUPLICATE_INDEX_VERSION, 'sources': [], 'fingerprints': {}}
+        indexed = manifest['sources']
+
+    lookup = pd.Index(hashes)
+    new_hashes = []
+    new_owners = []
+    duplicates_by_source = {}
+    for source, frame in frames_by_source.items():
+        source_hashes = row_hashes(frame)
+        repeated_in_file = pd.Series(source_hashes).duplicated().to_numpy()
+        positions = lookup.get_indexer(source_hashes)
+
+        if source in indexed:
+            # Rows this report added to the index are its originals; everything else was a duplicate
+            source_id = indexed.index(source)
+            found = positions >= 0
+            owned = np.zeros(len(source_hashes), dtype=bool)
+            owned[found] = owners[positions[found]] == source_id
+            duplicates = ~owned | repeated_in_file
+        else:
+            source_id = len(indexed)
+            indexed.append(source)
+            duplicates = (positions >= 0) | repeated_in_file
+            new_hashes.append(source_hashes[~duplicates])
+            new_owners.append(np.full((~duplicates).sum(), source_id, dtype=np.int32))
+
+            # Later reports in this run are checked against this one too
+            lookup = lookup.append(pd.Index(new_hashes[-1]))
+            owners = np.concatenate([owners, new_owners[-1]])
+
+        manifest['fingerprints'][source] = current[source]
+        duplicates_by_source[source] = duplicates
+
+    if new_hashes:
+        hashes = np.concatenate([hashes] + new_hashes)
+        save_duplicate_index(directory, hashes, owners, manifest)
+    return duplicates_by_source
+
+# ============================
+# Columnar Dataset Helpers
+# ============================
+
+
+def write_columnar_dataset(
+    directory, df, fingerprints, duplicate_counts, summary_fingerprints, daily_totals, text_columns=()
+):
+    """Write the cleaned dataset as fixed-width .npy column files plus string dictionaries.
+
+    Columns in text_columns are always dictionary-encoded, even when every value in them looks numeric.
+    The small per-day totals of the unique rows are stored alongside, so charts never scan the rows.
+    """
+    # Each build gets its own folder, written under a temporary name and renamed into place once complete
+    build_name = f"build-{pd.Timestamp.now().strftime('%Y%m%d%H%M%S%f')}-{os.getpid()}"
+    build_directory = os.path.join(directory, f"tmp-{build_name}")
+    os.makedirs(build_directory)
+
+    columns = []
+    for position, (name, values) in enumerate(df.items()):
+        file_name = f"column-{position:02d}"
+        if name in text_columns:
+            kind = 'dictionary'
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            kind = 'datetime'
+            data = values.to_numpy(dtype='datetime64[ns]')
+        elif pd.api.types.is_bool_dtype(values):
+            kind = 'numeric'
+            data = values.to_numpy(dtype=bool, na_value=False)
+        elif pd.api.types.is_numeric_dtype(values):
+            # Nullable integers stay integers unless they hold missing values, which only floats can store
+            kind = 'numeric'
+            if pd.api.types.is_integer_dtype(values) and not values.isna().any():
+                data = values.to_numpy(dtype=np.int64)
+            else:
+                data = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            kind = 'dictionary'
+
+        if kind == 'dictionary':
+            # Text columns become int32 codes into a sorted dictionary, -1 when missing
+            codes, uniques = pd.factorize(values.astype('string'), sort=True)
+            data = codes.astype(np.int32)
+            with open(os.path.join(build_directory, f"{file_name}.json"), 'w') as dictionary_file:
+                json.dump([str(value) for value in uniques], dictionary_file)
+        np.save(os.path.join(build_directory, f"{file_name}.npy"), data)
+        columns.append({'name': name, 'file': file_name, 'kind': kind})
+
+    np.savez(
+        os.path.join(build_directory, 'daily-totals.npz'),
+        dates=daily_totals['Date'].to_numpy(dtype='datetime64[ns]'),
+        records=daily_totals['Total Records'].to_numpy(dtype=np.int64),
+        amounts=daily_totals['Total Amount'].to_numpy(dtype=np.float64)
+    )
+
+    manifest = {
+        'build': build_name,
+        'rows': len(df),
+        'columns': columns,
+        'fingerprints': fingerprints,
+        'duplicate_counts': duplicate_counts,
+        'summary_fingerprints': summary_fingerprints
+    }
+
+    # Publish the finished build, then swap the manifest in atomically
+    os.rename(build_directory, os.path.join(directory, build_name))
+    write_atomically(
+        os.path.join(directory, 'manifest.json'),
+        lambda manifest_file: json.dump(manifest, manifest_file, indent=2)
+    )
+
+    # Only older builds and abandoned temporary folders are removed; processes that opened an older build
+    # mapped all of its columns up front, so removing the files does not affect them
+    for entry in os.listdir(directory):
+        if (entry.startswith('build-') and entry < build_name) or entry.startswith('tmp-build-'):
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+    return open_columnar_dataset(directory, fingerprints)
+
+
+@contextmanager
+def columnar_build_lock(directory):
+    """Hold an exclusive lock while the cache is rebuilt, so concurrent processes rebuild it one at a time."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'build.lock'), 'w') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def open_columnar_dataset(directory, fingerprints):
+    """Return the columnar dataset manifest with every column mapped, or None when it is missing or stale."""
+    manifest_path = os.path.join(directory, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return None
+
+    with open(manifest_path) as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest['fingerprints'] != fingerprints:
+        return None
+
+    # Map every column now, so a newer build removing this one later cannot pull files out from under us
+    build_directory = os.path.join(directory, manifest['build'])
+    manifest['mapped'] = {}
+    try:
+        for column in manifest['columns']:
+            path = os.path.join(build_directory, column['file'])
+            dictionary = None
+            if column['kind'] == 'dictionary':
+                with open(f"{path}.json") as dictionary_file:
+                    dictionary = json.load(dictionary_file)
+            manifest['mapped'][column['name']] = (np.load(f"{path}.npy", mmap_mode='r'), dictionary)
+        with np.load(os.path.join(build_directory, 'daily-totals.npz')) as totals_file:
+            manifest['daily_totals'] = pd.DataFrame({
+                'Date': totals_file['dates'],
+                'Total Records': totals_file['records'],
+                'Total Amount': totals_file['amounts']
+            })
+    except FileNotFoundError:
+        # The build was replaced and removed between reading the manifest and mapping it
+        return None
+    return manifest
+
+
+def open_column(manifest, name):
+    """Return one mapped column's values (codes for text) and its dictionary, or None."""
+    return manifest['mapped'][name]
+
+
+def read_columns(manifest, columns, rows=None):
+    """Read the given columns and rows of the columnar dataset; text columns come back as Categoricals."""
+    data = {}
+    for name in columns:
+        values, dictionary = open_column(manifest, name)
+        values = np.asarray(values if rows is None else values[rows])
+        if dictionary is not None:
+            # The stored codes are used as they are, without decoding every row to a string
+            values = pd.Categorical.from_codes(values, categories=dictionary)
+        data[name] = values
+    return pd.DataFrame(data)
+
+
+def decode_rows(manifest, columns, rows):
+    """Decode just the given rows of the mapped columns into plain values for a ColumnDataSource."""
+    data = {}
+    for name in columns:
+        values, dictionary = open_column(manifest, name)
+        values = values[rows]
+        if dictionary is not None:
+            values = [dictionary[code] if code >= 0 else '' for code in values.tolist()]
+        data[name] = values
+    return data
+
+# ============================
+# Time Series Resolution Helpers
+# ============================
+
+# Maximum number of points drawn on the line chart at any zoom level
+LINE_CHART_MAX_POINTS = 500
+
+# Period frequency and hover label format for each resolution, finest first
+TIME_SERIES_RESOLUTIONS = {
+    "Daily": ("D", "%d %B %Y"),
+    "Weekly": ("W-SUN", "Week of %d %B %Y"),
+    "Monthly": ("M", "%B %Y"),
+}
+
+# Days per period of each resolution finer than Monthly
+RESOLUTION_PERIOD_DAYS = {
+    "Daily": 1,
+    "Weekly": 7,
+}
+
+# A window is drawn at the finest resolution with at most this many periods in view, LTTB-reduced to
+# LINE_CHART_MAX_POINTS; Monthly is only the fallback for windows too long even for Weekly
+LINE_CHART_MAX_VISIBLE_PERIODS = 20 * LINE_CHART_MAX_POINTS
+
+
+def build_daily_totals(df):
+    """Count the rows and total the Amount of each day, the finest grain any line chart resolution needs."""
+    dated = df.dropna(subset=['Date'])
+    grouped = dated.groupby(dated['Date'].dt.normalize())['Amount'].agg(['size', 'sum'])
+    return pd.DataFrame({
+        'Date': grouped.index.to_numpy(dtype='datetime64[ns]'),
+        'Total Records': grouped['size'].to_numpy(dtype=np.int64),
+        'Total Amount': grouped['sum'].to_numpy(dtype=np.float64)
+    })
+
+
+def build_time_series(daily_totals, resolution):
+    """Aggregate the daily totals per period, filling empty periods with zero."""
+    frequency, label_format = TIME_SERIES_RESOLUTIONS[resolution]
+    periods = daily_totals['Date'].dt.to_period(frequency)
+    grouped = daily_totals.groupby(periods)[['Total Records', 'Total Amount']].sum()
+    if not grouped.empty:
+        grouped = grouped.reindex(
+            pd.period_range(grouped.index.min(), grouped.index.max(), freq=frequency),
+            fill_value=0
+        )
+
+    series = pd.DataFrame({
+        'Date': grouped.index.start_time,
+        'Total Records': grouped['Total Records'].astype(int).to_numpy(),
+        'Total Amount': grouped['Total Amount'].astype(float).to_numpy()
+    })
+    series['Period'] = series['Date'].dt.strftime(label_format)
+    return series
+
+
+def lttb_indices(x, y, threshold):
+    """Return the indices kept by Largest-Triangle-Three-Buckets downsampling."""
+    n = len(x)
+    if threshold < 3 or n <= threshold:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Interior points are split into threshold - 2 buckets; first and last points are always kept
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    indices = np.empty(threshold, dtype=int)
+    indices[0] = 0
+    selected = 0
+
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+
+        # Keep the point forming the largest triangle with the previous pick and the next bucket average
+        areas = np.abs(
+            (x[selected] - next_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (next_y - y[selected])
+        )
+        selected = start + int(np.argmax(areas))
+        indices[i + 1] = selected
+
+    indices[-1] = n - 1
+    return indices
+
+
+def downsample_series(series, max_points=LINE_CHART_MAX_POINTS):
+    """Reduce a time series to at most max_points rows while preserving its visual shape."""
+    x = series['Date'].astype('int64').to_numpy()
+    keep = lttb_indices(x, series['Total Amount'].to_numpy(), max_points)
+    return series.iloc[keep].reset_index(drop=True)
+
+
+def choose_resolution(span_days):
+    """Pick the finest resolution that puts at most LINE_CHART_MAX_VISIBLE_PERIODS periods in the visible x-range."""
+    for resolution, period_days in RESOLUTION_PERIOD_DAYS.items():
+        if span_days / period_days <= LINE_CHART_MAX_VISIBLE_PERIODS:
+            return resolution
+    return "Monthly"
+
+# ============================
+# Facet Helpers
+# ============================
+
+# Filter dimensions of the Data tab, in the order their codes are passed to FacetCountsJavaScript
+FACET_DIMENSIONS = ['Expense Area', 'Supplier', 'Month', 'Transaction Ref']
+
+# Rows scanned between cancellation checks in compute_facet_counts
+FACET_CHUNK_ROWS = 65536
+
+# Server mode: filter worker threads shared by all sessions, and the quiet period before a filter runs
+FILTER_WORKERS = 4
+FILTER_DEBOUNCE_MS = 250
+
+# Server mode: rows of the Data tab decoded and sent to the browser at a time
+DATA_TAB_PAGE_ROWS = 1000
+
+
+def read_facet_codes(manifest, rows=None, dimensions=FACET_DIMENSIONS):
+    """Read each facet column's stored int32 codes and sorted dictionary from the columnar dataset."""
+    codes = []
+    dictionaries = []
+    for dimension in dimensions:
+        dimension_codes, dictionary = open_column(manifest, dimension)
+        codes.append(dimension_codes if rows is None else dimension_codes[rows])
+        dictionaries.append(dictionary)
+    return codes, dictionaries
+
+
+def facet_options(dictionary, counts, selected='All'):
+    """Build Select options labelled "value (n)", mirroring facetOptions in FacetCountsJavaScript."""
+    options = [
+        (value, f"{value} ({count})")
+        for value, count in zip(dictionary, counts)
+        if count > 0 or value == selected
+    ]
+    return [('All', f"All ({int(np.sum(counts))})")] + options
+
+
+def compute_facet_counts(codes, dictionaries, allowed, row_mask, cancel_event=None):
+    """Numpy counterpart of facetCounts in FacetCountsJavaScript; returns None once cancel_event is set."""
+    # Missing values (code -1) index the trailing False and so fail any active filter
+    allowed = [None if flags is None else np.append(flags, False) for flags in allowed]
+    counts = [np.zeros(len(dictionary), dtype=np.int64) for dictionary in dictionaries]
+    indices = []
+
+    for start in range(0, len(row_mask), FACET_CHUNK_ROWS):
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+
+        stop = min(start + FACET_CHUNK_ROWS, len(row_mask))
+        chunk_codes = [dimension_codes[start:stop] for dimension_codes in codes]
+        failures = np.zeros(stop - start, dtype=np.int8)
+        failed = np.full(stop - start, -1, dtype=np.int8)
+        for d, flags in enumerate(allowed):
+            if flags is not None:
+                fails = ~flags[chunk_codes[d]]
+                failures += fails
+                failed[fails] = d
+
+        # A row failing exactly one facet still counts towards that facet's options
+        rows = row_mask[start:stop]
+        matched = rows & (failures == 0)
+        near_miss = rows & (failures == 1)
+        indices.append(np.flatnonzero(matched) + start)
+        for d, dimension_codes in enumerate(chunk_codes):
+            counted = (matched | (near_miss & (failed == d))) & (dimension_codes >= 0)
+            counts[d] += np.bincount(dimension_codes[counted], minlength=len(counts[d]))
+
+    return (np.concatenate(indices) if indices else np.empty(0, dtype=int)), counts
+
+
+def shared_filter_executor():
+    """Return the thread pool shared by every session of the served app, creating it on first use."""
+    # The script runs once per session, so the pool lives on the server context rather than in this module
+    server_context = curdoc().session_context.server_context
+    executor = getattr(server_context, 'filter_executor', None)
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=FILTER_WORKERS, thread_name_prefix='dashboard-filter')
+        server_context.filter_executor = executor
+    return executor
+
+# ============================
+# Distribution Summary Helpers
+# ============================
+
+# Columns each persisted summary is grouped by
+SUMMARY_GROUP_COLUMNS = ['Month', 'Supplier', 'Expense Area']
+
+# Quantile sketches bucket |Amount| logarithmically so estimates stay within 1% of the true value
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+
+# Fixed histogram bins shared by every group so histograms merge by adding counts
+AMOUNT_HISTOGRAM_EDGES = [
+    -np.inf, 0, 25000, 50000, 100000, 250000, 500000,
+    1000000, 2500000, 5000000, 10000000, np.inf
+]
+AMOUNT_HISTOGRAM_LABELS = [
+    "< £0", "£0-25k", "£25k-50k", "£50k-100k", "£100k-250k", "£250k-500k",
+    "£500k-1m", "£1m-2.5m", "£2.5m-5m", "£5m-10m", "£10m+"
+]
+
+# Quantiles reported on the distribution chart
+DISTRIBUTION_QUANTILES = [0.5, 0.9, 0.95, 0.99]
+DISTRIBUTION_QUANTILE_LABELS = ["Median", "p90", "p95", "p99"]
+
+# Persisted summary tables, each carrying a 'Source' column naming the input file it came from
+SUMMARY_TABLES = ['monthly', 'sketches', 'histograms']
+
+# Text columns of the summary tables; every other column is an integer or float count or total
+SUMMARY_TEXT_COLUMNS = SUMMARY_GROUP_COLUMNS + ['Source']
+
+
+def build_summaries(df, source):
+    """Build monthly totals, Amount sketch buckets and Amount histogram counts for one input file."""
+    amounts = df['Amount'].to_numpy(dtype=float)
+    magnitudes = np.abs(amounts)
+
+    signs = np.sign(amounts).astype(int)
+    buckets = np.zeros(len(amounts), dtype=int)
+    nonzero = magnitudes > 0
+    buckets[nonzero] = np.ceil(np.log(magnitudes[nonzero]) / np.log(SKETCH_GAMMA)).astype(int)
+
+    bins = np.searchsorted(AMOUNT_HISTOGRAM_EDGES, amounts, side='right') - 1
+    bins = np.clip(bins, 0, len(AMOUNT_HISTOGRAM_LABELS) - 1)
+
+    # Group keys are text even when a report's values all looked numeric, so they match the persisted tables
+    groups = df[SUMMARY_GROUP_COLUMNS].astype('string')
+    monthly = df.groupby(groups['Month'])['Amount'].agg(['size', 'sum']).reset_index()
+    monthly.columns = ['Month', 'Total Records', 'Total Amount']
+    sketches = groups.assign(Sign=signs, Bucket=buckets).groupby(
+        SUMMARY_GROUP_COLUMNS + ['Sign', 'Bucket'], dropna=False
+    ).size().reset_index(name='Count')
+    histograms = groups.assign(Bin=bins).groupby(
+        SUMMARY_GROUP_COLUMNS + ['Bin'], dropna=False
+    ).size().reset_index(name='Count')
+
+    tables = {'monthly': monthly, 'sketches': sketches, 'histograms': histograms}
+    return {name: table.assign(Source=source) for name, table in tables.items()}
+
+
+def merge_summaries(table, by):
+    """Merge summary rows sharing the same key columns by adding their counts and totals."""
+    value_columns = [name for name in ('Count', 'Total Records', 'Total Amount') if name in table.columns]
+    return table.groupby(by, dropna=False)[value_columns].sum().reset_index()
+
+
+def sketch_quantiles(sketch, quantiles=DISTRIBUTION_QUANTILES):
+    """Estimate Amount quantiles from merged sketch buckets without touching the raw rows."""
+    counts = sketch['Count'].to_numpy()
+    if counts.sum() == 0:
+        return [float('nan')] * len(quantiles)
+
+    # Each bucket is represented by the value with the smallest worst-case relative error
+    signs = sketch['Sign'].to_numpy()
+    magnitudes = 2 * SKETCH_GAMMA ** sketch['Bucket'].to_numpy(dtype=float) / (SKETCH_GAMMA + 1)
+    values = np.where(signs == 0, 0.0, signs * magnitudes)
+
+    order = np.argsort(values, kind='stable')
+    values = values[order]
+    cumulative = np.cumsum(counts[order])
+    ranks = np.asarray(quantiles) * (cumulative[-1] - 1)
+    return values[np.searchsorted(cumulative, ranks, side='right')].tolist()
+
+
+def load_summaries(directory):
+    """Load the persisted summary tables and the fingerprints of the sources they were built from."""
+    manifest_path = os.path.join(directory, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return {}, {}
+
+    with open(manifest_path) as manifest_file:
+        fingerprints = json.load(manifest_file)
+
+    # Tables are plain CSV; only an empty field is read as missing, so a supplier named "NA" stays text
+    tables = {}
+    for name in SUMMARY_TABLES:
+        table_path = os.path.join(directory, f"{name}.csv")
+        if not os.path.exists(table_path):
+            print(f"Summary table {table_path} is missing.")
+            return {}, {}
+        tables[name] = pd.read_csv(
+            table_path,
+            dtype={column: 'string' for column in SUMMARY_TEXT_COLUMNS},
+            keep_default_na=False,
+            na_values={column: [''] for column in SUMMARY_TEXT_COLUMNS}
+        )
+    return tables, fingerprints
+
+
+def save_summaries(directory, tables, fingerprints):
+    """Persist the summary tables next to a manifest of source fingerprints."""
+    os.makedirs(directory, exist_ok=True)
+    # The manifest goes last, so a reader never pairs it with tables from an earlier save
+    for name in SUMMARY_TABLES:
+        write_atomically(
+            os.path.join(directory, f"{name}.csv"),
+            lambda table_file, name=name: tables[name].to_csv(table_file, index=False, lineterminator='\n')
+        )
+
+        # Summaries used to be pickled; reading a pickle can run code, so old ones are not kept around
+        pickle_path = os.path.join(directory, f"{name}.pkl")
+        if os.path.exists(pickle_path):
+            os.remove(pickle_path)
+    write_atomically(
+        os.path.join(directory, 'manifest.json'),
+        lambda manifest_file: json.dump(fingerprints, manifest_file, indent=2)
+    )
+
+
+def update_summaries(directory, frames_by_source):
+    """Rebuild summaries only for new or changed sources and merge them with the persisted ones."""
+    tables, fingerprints = load_summaries(directory)
+    # Deduplication can change a report's rows without touching its file, so the rows are fingerprinted too
+    current = {
+        source: dict(
+            source_fingerprint(source),
+            rows=len(frame),
+            checksum=int(row_hashes(frame).sum())
+        )
+        for source, frame in frames_by_source.items()
+    }
+    stale = [source for source in frames_by_source if fingerprints.get(source) != current[source]]
+    reused = set(frames_by_source) - set(stale)
+
+    # Drop summaries of sources that changed or are no longer loaded
+    tables = {
+        name: tables[name][tables[name]['Source'].isin(reused)]
+        for name in tables
+    }
+    for source in stale:
+        print(f"Building summaries for {source}...")
+        built = build_summaries(frames_by_source[source], source)
+        tables = {
+            name: pd.concat([tables[name], built[name]], ignore_index=True) if name in tables else built[name]
+            for name in SUMMARY_TABLES
+        }
+    print(f"Reused persisted summaries for {len(reused)} source(s), rebuilt {len(stale)}.")
+
+    if stale or set(fingerprints) != set(current):
+        save_summaries(directory, tables, current)
+    return tables, current
+
+
+def open_cached_dataset(columnar_directory, aggregates_directory, fingerprints):
+    """Return the mapped columnar dataset and its summary tables, or (None, None) when either is stale."""
+    manifest = open_columnar_dataset(columnar_directory, fingerprints)
+    tables, summary_fingerprints = load_summaries(aggregates_directory)
+    # The persisted summaries must be the ones written alongside this dataset, not from other inputs
+    if manifest is None or not tables or summary_fingerprints != manifest.get('summary_fingerprints'):
+        return None, None
+    return manifest, tables
+
+# ============================
+# TAB 0: Summary
+# ============================
+
+try:
+    print("Loading BFIPublicDataDF...")
+    # Every spend report in the input directory is combined
+    input_file_paths = sorted(glob.glob(os.path.join(input_directory, '*.csv')))
+    if not input_file_paths:
+        raise FileNotFoundError(f"No spend report CSV files found in {input_directory}")
+
+    # Open the memory-mapped dataset when it was built from these exact reports
+    InputFingerprints = {path: source_fingerprint(path) for path in input_file_paths}
+    ColumnarManifest, SummaryTables = open_cached_dataset(columnar_directory, aggregates_directory, InputFingerprints)
+
+    if ColumnarManifest is None:
+        # Rebuilds are serialised; a process that waited on another's rebuild finds the cache current
+        with columnar_build_lock(columnar_directory):
+            ColumnarManifest, SummaryTables = open_cached_dataset(
+                columnar_directory, aggregates_directory, InputFingerprints
+            )
+            if ColumnarManifest is None:
+                # Load and clean each report, parsing Dates and converting 'Amount' to numeric
+                ReportDfs = {}
+                for input_file_path in input_file_paths:
+                    print(f"Loading {input_file_path}...")
+                    ReportDfs[input_file_path] = load_spend_report(input_file_path)
+                    print(f"Record Count: {ReportDfs[input_file_path].shape}")
+
+                # Detect transactions repeated within or across overlapping reports
+                print("Checking for duplicate transactions...")
+                DuplicateMasks = find_duplicates(aggregates_directory, ReportDfs)
+                DuplicateCounts = {source: int(duplicates.sum()) for source, duplicates in DuplicateMasks.items()}
+
+                # Build monthly totals and Amount distribution summaries, reusing persisted ones for unchanged inputs
+                UniqueReportDfs = {
+                    source: report[~DuplicateMasks[source]].reset_index(drop=True)
+                    for source, report in ReportDfs.items()
+                }
+                SummaryTables, SummaryFingerprints = update_summaries(aggregates_directory, UniqueReportDfs)
+
+                print(f"Writing memory-mapped dataset to {columnar_directory}...")
+                ColumnarManifest = write_columnar_dataset(
+                    columnar_directory,
+                    pd.concat(
+                        [report.assign(Duplicate=DuplicateMasks[source]) for source, report in ReportDfs.items()],
+                        ignore_index=True
+                    ),
+                    InputFingerprints,
+                    DuplicateCounts,
+                    SummaryFingerprints,
+                    build_daily_totals(pd.concat(UniqueReportDfs.values(), ignore_index=True)),
+                    text_columns=FACET_DIMENSIONS
+                )
+    else:
+        print(f"Opening memory-mapped dataset from {columnar_directory}...")
+    DuplicateCounts = ColumnarManifest['duplicate_counts']
+
+    for source, count in DuplicateCounts.items():
+        print(f"{source}: {count} duplicate rows {'removed' if DROP_DUPLICATES else 'flagged'}")
+
+    # Totals only ever count each transaction once; the per-day totals of the unique rows were stored with
+    # the dataset, so this tab and the line chart never touch the row data
+    DailyTotalsDf = ColumnarManifest['daily_totals']
+    print("Daily totals loaded successfully:")
+    print(DailyTotalsDf.head())
+
+    MonthlySummaryDf = merge_summaries(SummaryTables['monthly'], ['Month']).dropna(subset=['Month'])
 
     # Aggregate total records by Month
-    SummaryDf = BFIPublicDataDF.groupby('Month').size().reset_index(name='Total Records')
+    SummaryDf = MonthlySummaryDf[['Month', 'Total Records']].reset_index(drop=True)
     print("Aggregated Summary:")
     print(SummaryDf.head())
 
@@ -239,7 +1070,11 @@ try:
             <p><b>Data Sources:</b> Data Source is British Film Institute Spend over £25000 public dataset.</p>
             <p><b>Data:</b> Downloadable Data for the dataset</p>
             <p><b>Graphs:</b> Interactive Graphs for the dataset</p>
-        """,
+        """ + "".join(
+            f"<p><b>{os.path.basename(source)}:</b> {count} duplicate rows "
+            f"{'removed' if DROP_DUPLICATES else 'flagged'}</p>"
+            for source, count in DuplicateCounts.items()
+        ),
         styles=footer_div_style,
         width=800
     )
@@ -264,40 +1099,56 @@ except Exception as e:
 # ============================
 
 try:
-    print("Loading BFIPublicDataDF for Data Tab...")
-    # Path to the data file (CSV format)
-    vouchers_data_path = 'data/input/tabula-bfi-payments-over-25000-report-2014-15.csv'
-
-    # Load the data
-    BFIPublicDataDF_DataTab = pd.read_csv(vouchers_data_path)
-    BFIPublicDataDF_DataTab.fillna("", inplace=True)
-    print("BFIPublicDataDF loaded successfully:")
-    print(BFIPublicDataDF_DataTab.head())
-    print(f"Record Count: {BFIPublicDataDF_DataTab.shape}")
-
-    # Specify the date format based on your data
-    print("Parsing Dates in BFIPublicDataDF_DataTab...")
-    BFIPublicDataDF_DataTab['Date'] = pd.to_datetime(
-        BFIPublicDataDF_DataTab['Date'],
-        format="%d/%m/%y",  # Two-digit year
-        errors='coerce'
+    print("Preparing BFIPublicDataDF for Data Tab...")
+    # The table shows every column; flagged duplicates stay visible unless they are dropped
+    DataTabColumns = [
+        column['name'] for column in ColumnarManifest['columns']
+        if not (DROP_DUPLICATES and column['name'] == 'Duplicate')
+    ]
+    DuplicateFlags, _ = open_column(ColumnarManifest, 'Duplicate')
+
+    if SERVER_MODE:
+        # Sessions share the mapped columns through the page cache: facets scan the stored codes in place,
+        # dropped duplicates are masked out rather than copied away, and only the page on screen is decoded
+        FacetCodes, FacetDictionaries = read_facet_codes(ColumnarManifest)
+        DataTabRowMask = ~DuplicateFlags if DROP_DUPLICATES else np.ones(ColumnarManifest['rows'], dtype=bool)
+        BFIPublicDataDFSource_DataTab = ColumnDataSource(data={name: [] for name in DataTabColumns})
+    else:
+        # Static output ships every row in the page itself, so they are decoded once here
+        DataTabRows = ~np.asarray(DuplicateFlags) if DROP_DUPLICATES else None
+        BFIPublicDataDF_DataTab = read_columns(ColumnarManifest, DataTabColumns, rows=DataTabRows)
+
+        # Blank out missing text so the table and filters can treat every value as a string
+        for text_column in BFIPublicDataDF_DataTab.columns.difference(['Date', 'Amount', 'Month', 'Duplicate']):
+            BFIPublicDataDF_DataTab[text_column] = BFIPublicDataDF_DataTab[text_column].astype(object).fillna("")
+        BFIPublicDataDF_DataTab['Month'] = BFIPublicDataDF_DataTab['Month'].astype(object)
+        print("BFIPublicDataDF loaded successfully:")
+        print(BFIPublicDataDF_DataTab.head())
+
+        # Configure source
+        BFIPublicDataDFSource_DataTab = ColumnDataSource(BFIPublicDataDF_DataTab)
+
+        # Faceting scans the integer codes already stored in the columnar dataset
+        FacetCodes, FacetDictionaries = read_facet_codes(ColumnarManifest, rows=DataTabRows)
+        DataTabRowMask = np.ones(len(BFIPublicDataDF_DataTab), dtype=bool)
+
+    # One unfiltered pass gives the initial option counts, and in server mode the rows to page through
+    DataTabIndices, FacetInitialCounts = compute_facet_counts(
+        FacetCodes, FacetDictionaries, [None] * len(FACET_DIMENSIONS), DataTabRowMask
     )
-    BFIPublicDataDF_DataTab['Month'] = BFIPublicDataDF_DataTab['Date'].dt.strftime('%B %Y')
-    print("Month extraction complete:")
-    print(BFIPublicDataDF_DataTab[['Date', 'Month']].head())
-
-    # Clean and convert 'Amount' to numeric
-    print("Cleaning and converting 'Amount' column to numeric...")
-    BFIPublicDataDF_DataTab['Amount'] = BFIPublicDataDF_DataTab['Amount'].replace({'£': '', ',': ''}, regex=True)
-    BFIPublicDataDF_DataTab['Amount'] = pd.to_numeric(BFIPublicDataDF_DataTab['Amount'], errors='coerce').fillna(0.0)
-    print("After cleaning, 'Amount' column:")
-    print(BFIPublicDataDF_DataTab['Amount'].head())
-
-    # Configure source
-    BFIPublicDataDFSource_DataTab = ColumnDataSource(BFIPublicDataDF_DataTab)
+    print(f"Record Count: {len(DataTabIndices)}")
+    print("Facet dictionary sizes:")
+    print(dict(zip(FACET_DIMENSIONS, (len(dictionary) for dictionary in FacetDictionaries))))
 
     # Create AutocompleteInput for 'Expense Area'
-    ExpenseAreaCompletions = sorted(BFIPublicDataDF_DataTab['Expense Area'].unique().tolist())
+    # Dropped duplicates can leave dictionary values with no rows, so only values present are offered
+    ExpenseAreaCompletions = [
+        value for value, count in zip(
+            FacetDictionaries[FACET_DIMENSIONS.index('Expense Area')],
+            FacetInitialCounts[FACET_DIMENSIONS.index('Expense Area')]
+        )
+        if count > 0
+    ]
 
     ExpenseAreaAutocompleteInput = AutocompleteInput(
         title="Search Expense Area",
@@ -309,218 +1160,243 @@ try:
         width=300
     )
 
-    # Dropdowns for Supplier, Month, and Transaction Ref
+    # Dropdowns for Supplier, Month, and Transaction Ref, labelled with row counts
     SupplierSelect = Select(
         title="Supplier",
         value='All',
-        options=['All'] + sorted(BFIPublicDataDF_DataTab['Supplier'].unique().tolist()),
+        options=facet_options(
+            FacetDictionaries[FACET_DIMENSIONS.index('Supplier')],
+            FacetInitialCounts[FACET_DIMENSIONS.index('Supplier')]
+        ),
         width=200
     )
 
     MonthSelect = Select(
         title="Month",
         value='All',
-        options=['All'] + sorted(BFIPublicDataDF_DataTab['Month'].dropna().unique().tolist()),
+        options=facet_options(
+            FacetDictionaries[FACET_DIMENSIONS.index('Month')],
+            FacetInitialCounts[FACET_DIMENSIONS.index('Month')]
+        ),
         width=200
     )
 
     TransactionRefSelect = Select(
         title="Transaction Ref",
         value='All',
-        options=['All'] + sorted(BFIPublicDataDF_DataTab['Transaction Ref'].unique().tolist()),
-        width=300
-    )
-
-    # Expense Area autocomplete callback
-    ExpenseAreaCallback = CustomJS(
-        args=dict(
-            source=BFIPublicDataDFSource_DataTab,
-            expense_area_autocomplete=ExpenseAreaAutocompleteInput,
-            supplier_select=SupplierSelect,
-            month_select=MonthSelect,
-            transaction_ref_select=TransactionRefSelect
-        ),
-        code="""
-        const expense_area = expense_area_autocomplete.value.toLowerCase();
-        const data = source.data;
-        const indices = [];
-        const suppliers = new Set();
-        const months = new Set();
-        const transactionRefs = new Set();
-
-        for (let i = 0; i < data['Expense Area'].length; i++) {
-            const expense_area_value = data['Expense Area'][i].toString().toLowerCase();
-            if (expense_area === '' || expense_area_value.includes(expense_area)) {
-                indices.push(i);
-                suppliers.add(data['Supplier'][i].toString());
-                months.add(data['Month'][i].toString());
-                transactionRefs.add(data['Transaction Ref'][i].toString());
-            }
-        }
-
-        // Update dropdowns based on filtered Expense Area
-        supplier_select.options = ['All'].concat(Array.from(suppliers).sort());
-        supplier_select.value = 'All';
-        
-        month_select.options = ['All'].concat(Array.from(months).sort());
-        month_select.value = 'All';
-        
-        transaction_ref_select.options = ['All'].concat(Array.from(transactionRefs).sort());
-        transaction_ref_select.value = 'All';
-
-        // Update the data table based on Expense Area filtering
-        source.selected.indices = indices;
-        source.change.emit();
-        """
-    )
-    ExpenseAreaAutocompleteInput.js_on_change('value', ExpenseAreaCallback)
-
-    # Supplier select callback
-    SupplierCallback = CustomJS(
-        args=dict(
-            source=BFIPublicDataDFSource_DataTab,
-            supplier_select=SupplierSelect,
-            month_select=MonthSelect,
-            expense_area_autocomplete=ExpenseAreaAutocompleteInput,
-            transaction_ref_select=TransactionRefSelect
-        ),
-        code="""
-        const supplier = supplier_select.value;
-        const data = source.data;
-        const indices = [];
-        const months = new Set();
-        const transactionRefs = new Set();
-
-        for (let i = 0; i < data['Supplier'].length; i++) {
-            if (supplier === 'All' || data['Supplier'][i] === supplier) {
-                indices.push(i);
-                months.add(data['Month'][i].toString());
-                transactionRefs.add(data['Transaction Ref'][i].toString());
-            }
-        }
-
-        // Update dropdowns based on supplier filtering
-        month_select.options = ['All'].concat(Array.from(months).sort());
-        month_select.value = 'All';
-        
-        transaction_ref_select.options = ['All'].concat(Array.from(transactionRefs).sort());
-        transaction_ref_select.value = 'All';
-
-        source.selected.indices = indices;
-        source.change.emit();
-        """
-    )
-    SupplierSelect.js_on_change('value', SupplierCallback)
-
-    # Month select callback
-    MonthCallback = CustomJS(
-        args=dict(
-            source=BFIPublicDataDFSource_DataTab,
-            supplier_select=SupplierSelect,
-            month_select=MonthSelect,
-            expense_area_autocomplete=ExpenseAreaAutocompleteInput,
-            transaction_ref_select=TransactionRefSelect
+        options=facet_options(
+            FacetDictionaries[FACET_DIMENSIONS.index('Transaction Ref')],
+            FacetInitialCounts[FACET_DIMENSIONS.index('Transaction Ref')]
         ),
-        code="""
-        const month = month_select.value;
-        const data = source.data;
-        const indices = [];
-        const suppliers = new Set();
-        const transactionRefs = new Set();
-
-        for (let i = 0; i < data['Month'].length; i++) {
-            if (month === 'All' || data['Month'][i] === month) {
-                indices.push(i);
-                suppliers.add(data['Supplier'][i].toString());
-                transactionRefs.add(data['Transaction Ref'][i].toString());
-            }
-        }
-
-        // Update dropdowns based on month filtering
-        supplier_select.options = ['All'].concat(Array.from(suppliers).sort());
-        supplier_select.value = 'All';
-        
-        transaction_ref_select.options = ['All'].concat(Array.from(transactionRefs).sort());
-        transaction_ref_select.value = 'All';
-
-        source.selected.indices = indices;
-        source.change.emit();
-        """
-    )
-    MonthSelect.js_on_change('value', MonthCallback)
-
-    # Transaction Ref select callback
-    TransactionRefCallback = CustomJS(
-        args=dict(source=BFIPublicDataDFSource_DataTab, transaction_ref_select=TransactionRefSelect),
-        code="""
-        const transaction_ref = transaction_ref_select.value;
-        const data = source.data;
-        const indices = [];
-        for (let i = 0; i < data['Transaction Ref'].length; i++) {
-            if (transaction_ref === 'All' || data['Transaction Ref'][i].toString() === transaction_ref) {
-                indices.push(i);
-            }
-        }
-        source.selected.indices = indices; // Update selected indices
-        source.change.emit();
-        """
+        width=300
     )
-    TransactionRefSelect.js_on_change('value', TransactionRefCallback)
 
     # Checkbox Filters
     checkbox_filter_paid = Checkbox(label="Paid Only", active=False)
     checkbox_filter_unpaid = Checkbox(label="Unpaid Only", active=False)
 
-    # Filter based on multiple criteria
-    BFIPublicDataDFFilter = CustomJSFilter(
-        args=dict(
-            supplier_select=SupplierSelect,
-            month_select=MonthSelect,
-            expense_area_autocomplete=ExpenseAreaAutocompleteInput,
-            transaction_ref_select=TransactionRefSelect,
-            checkbox_paid=checkbox_filter_paid,
-            checkbox_unpaid=checkbox_filter_unpaid
-        ),
-        code="""
-        const selectedSupplier = supplier_select.value;
-        const selectedMonth = month_select.value;
-        const expense_area = expense_area_autocomplete.value.toLowerCase();
-        const transaction_ref = transaction_ref_select.value;
-        const only_show_paid = checkbox_paid.active;
-        const unpaid_only = checkbox_unpaid.active;
-        const data = source.data;
-        const indices = [];
-
-        for (let i = 0; i < data['Supplier'].length; i++) {
-            const amount = data['Amount'][i];
-            const supplierMatch = (selectedSupplier === 'All') || (data['Supplier'][i] === selectedSupplier);
-            const monthMatch = (selectedMonth === 'All') || (data['Month'][i] === selectedMonth);
-            const expenseAreaMatch = (expense_area === '') || (data['Expense Area'][i].toLowerCase().includes(expense_area));
-            const transactionRefMatch = (transaction_ref === 'All') || (data['Transaction Ref'][i].toString() === transaction_ref);
-            const paidMatch = (!only_show_paid) || (amount > 0);
-            const unpaidMatch = (!unpaid_only) || (amount === 0);
-
-            if (supplierMatch && monthMatch && expenseAreaMatch && transactionRefMatch && paidMatch && unpaidMatch) {
-                indices.push(i);
-            }
+    if SERVER_MODE:
+        # Filters run on the shared worker pool so a heavy session never blocks the event loop
+        filter_document = curdoc()
+        filter_executor = shared_filter_executor()
+        DataTabAmounts, _ = open_column(ColumnarManifest, 'Amount')
+        facet_selects = [None, SupplierSelect, MonthSelect, TransactionRefSelect]
+
+        # The table pages through the matching rows instead of holding them all
+        DataTabPreviousButton = Button(label="Previous", width=100)
+        DataTabNextButton = Button(label="Next", width=100)
+        DataTabPageDiv = Div(width=300, styles=footer_div_style)
+        DataTabPage = {'indices': DataTabIndices.astype(np.int32), 'page': 0}
+
+        def show_data_tab_page():
+            indices = DataTabPage['indices']
+            pages = max(-(-len(indices) // DATA_TAB_PAGE_ROWS), 1)
+            DataTabPage['page'] = min(max(DataTabPage['page'], 0), pages - 1)
+            start = DataTabPage['page'] * DATA_TAB_PAGE_ROWS
+            rows = indices[start:start + DATA_TAB_PAGE_ROWS]
+
+            BFIPublicDataDFSource_DataTab.data = decode_rows(ColumnarManifest, DataTabColumns, rows)
+            DataTabPageDiv.text = f"Rows {start + min(len(rows), 1):,}-{start + len(rows):,} of {len(indices):,}"
+            DataTabPreviousButton.disabled = DataTabPage['page'] == 0
+            DataTabNextButton.disabled = DataTabPage['page'] >= pages - 1
+
+        def turn_data_tab_page(step):
+            DataTabPage['page'] += step
+            show_data_tab_page()
+
+        DataTabPreviousButton.on_click(partial(turn_data_tab_page, -1))
+        DataTabNextButton.on_click(partial(turn_data_tab_page, 1))
+        show_data_tab_page()
+
+        # Per-session request state; only the newest generation may publish its result
+        FilterRequestState = {
+            'generation': 0,
+            'expense_area': '',
+            'debounce': None,
+            'future': None,
+            'cancel': None
         }
 
-        return indices;
-        """
-    )
-
-    # Add checkbox change callback to refresh the data source
-    checkbox_callback = CustomJS(
-        args=dict(source=BFIPublicDataDFSource_DataTab),
-        code="""
-        source.change.emit();
-        """
-    )
-    checkbox_filter_paid.js_on_change('active', checkbox_callback)
-    checkbox_filter_unpaid.js_on_change('active', checkbox_callback)
+        def run_filter(expense_area, selections, only_show_paid, unpaid_only, cancel_event):
+            # Resolve each filter against its dictionary once instead of once per row
+            allowed = []
+            for d, dictionary in enumerate(FacetDictionaries):
+                if d == 0:
+                    allowed.append(
+                        None if expense_area == ''
+                        else np.array([expense_area in value.lower() for value in dictionary], dtype=bool)
+                    )
+                else:
+                    selected = selections[d]
+                    allowed.append(
+                        None if selected == 'All'
+                        else np.array([value == selected for value in dictionary], dtype=bool)
+                    )
+
+            row_mask = DataTabRowMask.copy()
+            if only_show_paid:
+                row_mask &= DataTabAmounts > 0
+            if unpaid_only:
+                row_mask &= DataTabAmounts == 0
+
+            return compute_facet_counts(FacetCodes, FacetDictionaries, allowed, row_mask, cancel_event)
+
+        def publish_filter(generation, future):
+            # Results of superseded or cancelled requests are dropped
+            if generation != FilterRequestState['generation'] or future.cancelled():
+                return
+            if future.exception() is not None:
+                print(f"Error filtering Data tab: {future.exception()}")
+                return
+            result = future.result()
+            if result is None:
+                return
+
+            indices, counts = result
+            ExpenseAreaAutocompleteInput.completions = [
+                value for value, count in zip(FacetDictionaries[0], counts[0]) if count > 0
+            ]
+            for d in range(1, len(facet_selects)):
+                facet_selects[d].options = facet_options(FacetDictionaries[d], counts[d], facet_selects[d].value)
+            DataTabPage['indices'] = indices.astype(np.int32)
+            DataTabPage['page'] = 0
+            show_data_tab_page()
+
+        def submit_filter():
+            FilterRequestState['debounce'] = None
+            FilterRequestState['generation'] += 1
+            generation = FilterRequestState['generation']
+
+            # Cancel the superseded request: drop it if still queued, stop it between chunks if running
+            if FilterRequestState['future'] is not None:
+                FilterRequestState['cancel'].set()
+                FilterRequestState['future'].cancel()
+
+            cancel_event = threading.Event()
+            future = filter_executor.submit(
+                run_filter,
+                FilterRequestState['expense_area'].lower(),
+                [None if select is None else select.value for select in facet_selects],
+                checkbox_filter_paid.active,
+                checkbox_filter_unpaid.active,
+                cancel_event
+            )
+            FilterRequestState['future'] = future
+            FilterRequestState['cancel'] = cancel_event
+
+            # Hand the result back to this session's event loop
+            future.add_done_callback(
+                lambda done: filter_document.add_next_tick_callback(partial(publish_filter, generation, done))
+            )
+
+        def schedule_filter(attr, old, new):
+            # Restart the debounce window on every change so a burst of keystrokes runs one filter
+            if FilterRequestState['debounce'] is not None:
+                filter_document.remove_timeout_callback(FilterRequestState['debounce'])
+            FilterRequestState['debounce'] = filter_document.add_timeout_callback(submit_filter, FILTER_DEBOUNCE_MS)
+
+        def schedule_expense_area_filter(attr, old, new):
+            FilterRequestState['expense_area'] = new or ''
+            schedule_filter(attr, old, new)
+
+        # Bokeh clears this script's globals before session-destroyed callbacks run, so bind the state here
+        def cancel_pending_filter(session_context, state=FilterRequestState):
+            if state['cancel'] is not None:
+                state['cancel'].set()
+
+        filter_document.on_session_destroyed(cancel_pending_filter)
+
+        # value_input changes on every keystroke, value when a completion is chosen
+        ExpenseAreaAutocompleteInput.on_change('value_input', schedule_expense_area_filter)
+        ExpenseAreaAutocompleteInput.on_change('value', schedule_expense_area_filter)
+        SupplierSelect.on_change('value', schedule_filter)
+        MonthSelect.on_change('value', schedule_filter)
+        TransactionRefSelect.on_change('value', schedule_filter)
+        checkbox_filter_paid.on_change('active', schedule_filter)
+        checkbox_filter_unpaid.on_change('active', schedule_filter)
+    else:
+        # Rows shown in the table; None shows every row until a filter is applied
+        BFIPublicDataDFFilter = IndexFilter(indices=None)
+
+        # Shared filter callback: one scan filters the rows and recounts every facet
+        FacetCallback = CustomJS(
+            args=dict(
+                source=BFIPublicDataDFSource_DataTab,
+                index_filter=BFIPublicDataDFFilter,
+                codes=FacetCodes,
+                dictionaries=FacetDictionaries,
+                expense_area_autocomplete=ExpenseAreaAutocompleteInput,
+                supplier_select=SupplierSelect,
+                month_select=MonthSelect,
+                transaction_ref_select=TransactionRefSelect,
+                checkbox_paid=checkbox_filter_paid,
+                checkbox_unpaid=checkbox_filter_unpaid
+            ),
+            code=FacetCountsJavaScript + """
+            // Facet order matches FACET_DIMENSIONS: Expense Area, Supplier, Month, Transaction Ref
+            const expense_area = expense_area_autocomplete.value.toLowerCase();
+            const selects = [null, supplier_select, month_select, transaction_ref_select];
+
+            // Resolve each filter against its dictionary once instead of once per row
+            const allowed = dictionaries.map((dictionary, d) => {
+                if (d === 0) {
+                    if (expense_area === '') {
+                        return null;
+                    }
+                    return dictionary.map(value => value.toLowerCase().includes(expense_area));
+                }
+                const selected = selects[d].value;
+                return selected === 'All' ? null : dictionary.map(value => value === selected);
+            });
+
+            const amounts = source.data['Amount'];
+            const only_show_paid = checkbox_paid.active;
+            const unpaid_only = checkbox_unpaid.active;
+            const row_allowed = (i) => (!only_show_paid || amounts[i] > 0) && (!unpaid_only || amounts[i] === 0);
+
+            const result = facetCounts(codes, dictionaries, allowed, row_allowed);
+
+            // Only options change, never values, so updating them does not retrigger this callback
+            expense_area_autocomplete.completions = dictionaries[0].filter((value, code) => result.counts[0][code] > 0);
+            for (let d = 1; d < selects.length; d++) {
+                selects[d].options = facetOptions(dictionaries[d], result.counts[d], selects[d].value);
+            }
 
-    # Configure CDS view
-    BFIPublicDataDFView = CDSView(filter=BFIPublicDataDFFilter)
+            const filtered = allowed.some(flags => flags !== null) || only_show_paid || unpaid_only;
+            index_filter.indices = filtered ? result.indices : null;
+            source.selected.indices = result.indices;
+            source.change.emit();
+            """
+        )
+        ExpenseAreaAutocompleteInput.js_on_change('value', FacetCallback)
+        SupplierSelect.js_on_change('value', FacetCallback)
+        MonthSelect.js_on_change('value', FacetCallback)
+        TransactionRefSelect.js_on_change('value', FacetCallback)
+        checkbox_filter_paid.js_on_change('active', FacetCallback)
+        checkbox_filter_unpaid.js_on_change('active', FacetCallback)
+
+    # Configure CDS view; in server mode the source already holds just the matching page
+    BFIPublicDataDFView = CDSView() if SERVER_MODE else CDSView(filter=BFIPublicDataDFFilter)
 
     # Configure table columns
     BFIPublicDataDFColumns = [
@@ -533,6 +1409,8 @@ try:
         TableColumn(field='Transaction Ref', title='Transaction Ref', width=200),
         TableColumn(field='Amount', title='Amount (£)', formatter=NumberFormatter(format='£0,0.00'), width=120)
     ]
+    if not DROP_DUPLICATES:
+        BFIPublicDataDFColumns.append(TableColumn(field='Duplicate', title='Duplicate', width=100))
 
     # Configure table
     BFIPublicDataDFTable = DataTable(
@@ -541,6 +1419,7 @@ try:
         view=BFIPublicDataDFView,
         index_position=None,
         reorderable=False,
+        sortable=not SERVER_MODE,
         width=1500,
         height=500,
         height_policy='auto'
@@ -552,10 +1431,26 @@ try:
         button_type="primary",
         width=120
     )
-    BFIPublicDataDFDownloadButton.js_on_click(CustomJS(
-        args=dict(file='BFIOver25000Data.csv', source=BFIPublicDataDFSource_DataTab),
-        code=ExportDataJavaScript + "\n getcsv(source, file);"
-    ))
+    if SERVER_MODE:
+        # The browser only holds one page, so the rows are decoded into a throwaway source on request
+        DataTabExportSource = ColumnDataSource(data={name: [] for name in DataTabColumns})
+        DataTabExportSource.js_on_change('data', CustomJS(
+            args=dict(file='BFIOver25000Data.csv', source=DataTabExportSource),
+            code=ExportDataJavaScript + "\n if (source.get_length() > 0) { getcsv(source, file); }"
+        ))
+
+        def export_data_tab():
+            DataTabExportSource.data = {name: [] for name in DataTabColumns}
+            DataTabExportSource.data = decode_rows(ColumnarManifest, DataTabColumns, DataTabIndices)
+
+        # Nothing in the layout references the export source, so it joins the document as its own root
+        filter_document.add_root(DataTabExportSource)
+        BFIPublicDataDFDownloadButton.on_click(export_data_tab)
+    else:
+        BFIPublicDataDFDownloadButton.js_on_click(CustomJS(
+            args=dict(file='BFIOver25000Data.csv', source=BFIPublicDataDFSource_DataTab),
+            code=ExportDataJavaScript + "\n getcsv(source, file);"
+        ))
 
     # Configure Div for Data Tab Header
     DataHeaderDiv = Div(
@@ -582,15 +1477,12 @@ try:
         width=1600
     )
 
-    # Configure layout for Tab 1
-    BFIPublicDataDFGridPlot = column(
-        DataHeaderDiv,
-        filters_row,
-        checkboxes_row,
-        BFIPublicDataDFTable,
-        BFIPublicDataDFDownloadButton,
-        sizing_mode='stretch_both'
-    )
+    # Configure layout for Tab 1, with page controls under the table in server mode
+    data_tab_children = [DataHeaderDiv, filters_row, checkboxes_row, BFIPublicDataDFTable]
+    if SERVER_MODE:
+        data_tab_children.append(row(DataTabPreviousButton, DataTabPageDiv, DataTabNextButton))
+    data_tab_children.append(BFIPublicDataDFDownloadButton)
+    BFIPublicDataDFGridPlot = column(*data_tab_children, sizing_mode='stretch_both')
     print("BFIPublicGridPlot constructed successfully.")
 
     # Define TabPanel for Tab 1
@@ -609,7 +1501,7 @@ try:
 
     # Aggregate total records by Month for Bar Chart (already done in SummaryDf)
     # Aggregate total Amount per Month for Line Chart
-    AmountSummaryDf = BFIPublicDataDF.groupby('Month')['Amount'].sum().reset_index(name='Total Amount')
+    AmountSummaryDf = MonthlySummaryDf[['Month', 'Total Amount']].reset_index(drop=True)
 
     # Merge both summaries for consistent x-axis
     GraphSummaryDf = pd.merge(SummaryDf, AmountSummaryDf, on='Month')
@@ -679,20 +1571,51 @@ try:
     bar_chart.axis.axis_label = "Month"
     bar_chart.axis.major_label_orientation = 1.0
 
+    # Pre-aggregate Total Amount at every resolution for the line chart
+    TimeSeriesByResolution = {
+        resolution: build_time_series(DailyTotalsDf, resolution)
+        for resolution in TIME_SERIES_RESOLUTIONS
+    }
+    for resolution, series in TimeSeriesByResolution.items():
+        print(f"{resolution} time series: {len(series)} periods")
+
+    # Start at the resolution that suits the full date range
+    daily_series = TimeSeriesByResolution['Daily']
+    full_span_days = (daily_series['Date'].max() - daily_series['Date'].min()).days if not daily_series.empty else 0
+    initial_resolution = choose_resolution(full_span_days)
+    print(f"Initial line chart resolution: {initial_resolution}")
+
+    # No window is wider than the full extent, so nothing coarser than the initial resolution is ever drawn
+    LineResolutions = list(TIME_SERIES_RESOLUTIONS)[:list(TIME_SERIES_RESOLUTIONS).index(initial_resolution) + 1]
+
+    InitialLineSeries = downsample_series(TimeSeriesByResolution[initial_resolution])
+    LineChartSource = ColumnDataSource(InitialLineSeries)
+
+    # Bound the x-range by the full series so Reset and panning always come back to the whole extent
+    if daily_series.empty:
+        LineChartRange = DataRange1d()
+    else:
+        line_start = min(TimeSeriesByResolution[resolution]['Date'].min() for resolution in LineResolutions)
+        line_end = daily_series['Date'].max()
+        LineChartRange = Range1d(start=line_start, end=line_end, bounds=(line_start, line_end))
+
     # Create Line Chart for Total Amount Over Time
     line_chart = figure(
         x_axis_type="datetime",
         height=600,
         width=1000,
-        title="Total Amount Over Time",
-        toolbar_location=None,
-        tools=""
+        title=f"Total Amount Over Time ({initial_resolution})",
+        x_range=LineChartRange,
+        toolbar_location="above",
+        tools="xpan,xwheel_zoom,reset",
+        active_drag="xpan",
+        active_scroll="xwheel_zoom"
     )
 
     line_chart.line(
-        x='Month_Date',
+        x='Date',
         y='Total Amount',
-        source=GraphSummarySource,
+        source=LineChartSource,
         line_width=2,
         color=ACCENT_COLOR,
         legend_label="Total Amount"
@@ -700,32 +1623,237 @@ try:
 
     # Add Circle Markers to Line Chart
     line_chart.circle(
-        x='Month_Date',
+        x='Date',
         y='Total Amount',
-        source=GraphSummarySource,
+        source=LineChartSource,
         size=6,
         color=ACCENT_COLOR
     )
 
     # Add Hover Tool to Line Chart
     hover_line = HoverTool(tooltips=[
-        ("Month", "@Month"),
+        ("Period", "@Period"),
+        ("Total Records", "@{Total Records}"),
         ("Total Amount (£)", "@{Total Amount}{0.00 a}")
     ], mode='vline')
 
     line_chart.add_tools(hover_line)
 
     # Style the Line Chart
-    line_chart.xaxis.axis_label = "Month"
+    line_chart.xaxis.axis_label = "Date"
     line_chart.yaxis.axis_label = "Total Amount (£)"
     line_chart.legend.location = "top_left"
     line_chart.legend.click_policy = "hide"
     line_chart.xaxis.major_label_orientation = 1.0
 
+    if SERVER_MODE:
+        # Re-aggregate and downsample only the visible window once a zoom or pan finishes
+        def update_line_resolution(event):
+            resolution = choose_resolution((event.x1 - event.x0) / 86400000)
+            series = TimeSeriesByResolution[resolution]
+            period_ms = series['Date'].to_numpy().astype('datetime64[ms]').astype('int64')
+
+            # Include one period either side so the line runs off the edges of the plot
+            first = max(np.searchsorted(period_ms, event.x0) - 1, 0)
+            last = min(np.searchsorted(period_ms, event.x1, side='right') + 1, len(series))
+            visible = downsample_series(series.iloc[first:last].reset_index(drop=True))
+
+            LineChartSource.data = ColumnDataSource.from_df(visible)
+            line_chart.title.text = f"Total Amount Over Time ({resolution})"
+
+        # Reset shows the full extent again, so restore the series drawn at startup
+        def reset_line_resolution(event):
+            LineChartSource.data = ColumnDataSource.from_df(InitialLineSeries)
+            line_chart.title.text = f"Total Amount Over Time ({initial_resolution})"
+
+        line_chart.on_event(RangesUpdate, update_line_resolution)
+        line_chart.on_event(Reset, reset_line_resolution)
+    else:
+        # Static output ships every resolution the full extent can need, whole, and the browser slices the
+        # visible window and LTTB-reduces it on each zoom or pan, just like the server does
+        LineResolutionCallback = CustomJS(
+            args=dict(
+                source=LineChartSource,
+                x_range=line_chart.x_range,
+                title=line_chart.title,
+                resolution_names=LineResolutions,
+                resolution_period_days=[RESOLUTION_PERIOD_DAYS[resolution] for resolution in LineResolutions[:-1]],
+                max_visible_periods=LINE_CHART_MAX_VISIBLE_PERIODS,
+                max_points=LINE_CHART_MAX_POINTS,
+                series_sources=[
+                    ColumnDataSource(TimeSeriesByResolution[resolution])
+                    for resolution in LineResolutions
+                ]
+            ),
+            code=LineDownsampleJavaScript + """
+            const span_days = (x_range.end - x_range.start) / 86400000;
+            if (!isFinite(span_days)) {
+                return;
+            }
+
+            // Finest resolution with few enough periods in view; the last one shipped is the fallback
+            let index = resolution_names.length - 1;
+            for (let i = 0; i < resolution_names.length - 1; i++) {
+                if (span_days / resolution_period_days[i] <= max_visible_periods) {
+                    index = i;
+                    break;
+                }
+            }
+
+            // Include one period either side so the line runs off the edges of the plot
+            const series = series_sources[index].data;
+            const x = series['Date'];
+            const first = Math.max(searchSorted(x, x_range.start, false) - 1, 0);
+            const last = Math.min(searchSorted(x, x_range.end, true) + 1, x.length);
+            const keep = lttbIndices(
+                Array.from(x.slice(first, last)),
+                Array.from(series['Total Amount'].slice(first, last)),
+                max_points
+            );
+
+            const data = {};
+            for (const name of Object.keys(series)) {
+                data[name] = keep.map(i => series[name][first + i]);
+            }
+            source.data = data;
+            title.text = 'Total Amount Over Time (' + resolution_names[index] + ')';
+            """
+        )
+        line_chart.x_range.js_on_change('start', LineResolutionCallback)
+        line_chart.x_range.js_on_change('end', LineResolutionCallback)
+
+    # Merge the persisted sketches and histograms over months and sources for each Supplier/Expense Area view
+    DistributionKeys = []
+    DistributionCounts = []
+    DistributionQuantiles = []
+    for by in (['Supplier', 'Expense Area'], ['Supplier'], ['Expense Area'], []):
+        sketches = merge_summaries(SummaryTables['sketches'], by + ['Sign', 'Bucket'])
+        histograms = merge_summaries(SummaryTables['histograms'], by + ['Bin'])
+        for table in (sketches, histograms):
+            supplier_key = table['Supplier'].fillna('').astype(str) if 'Supplier' in by else 'All'
+            expense_area_key = table['Expense Area'].fillna('').astype(str) if 'Expense Area' in by else 'All'
+            table['Key'] = supplier_key + '|' + expense_area_key
+
+        sketch_groups = dict(list(sketches.groupby('Key')))
+        for key, histogram in histograms.groupby('Key'):
+            # Views of a missing Supplier or Expense Area cannot be selected
+            if histogram[by].isna().any(axis=None):
+                continue
+            counts = np.zeros(len(AMOUNT_HISTOGRAM_LABELS), dtype=int)
+            counts[histogram['Bin'].to_numpy()] = histogram['Count'].to_numpy()
+            DistributionKeys.append(key)
+            DistributionCounts.append(counts.tolist())
+            DistributionQuantiles.append(sketch_quantiles(sketch_groups[key]))
+    print(f"Distribution summaries prepared for {len(DistributionKeys)} Supplier/Expense Area views.")
+
+    # Selectors for the Amount Distribution Chart; rows missing a value only count towards 'All'
+    DistributionSupplierSelect = Select(
+        title="Supplier",
+        value='All',
+        options=['All'] + sorted(SummaryTables['histograms']['Supplier'].dropna().astype(str).unique().tolist()),
+        width=300
+    )
+
+    DistributionExpenseAreaSelect = Select(
+        title="Expense Area",
+        value='All',
+        options=['All'] + sorted(SummaryTables['histograms']['Expense Area'].dropna().astype(str).unique().tolist()),
+        width=300
+    )
+
+    # Create Bar Chart for the Amount Distribution
+    initial_distribution = DistributionKeys.index('All|All')
+    DistributionSource = ColumnDataSource(data=dict(
+        Bin=AMOUNT_HISTOGRAM_LABELS,
+        Count=DistributionCounts[initial_distribution]
+    ))
+
+    distribution_chart = figure(
+        x_range=AMOUNT_HISTOGRAM_LABELS,
+        height=600,
+        width=1000,
+        title="Amount Distribution",
+        toolbar_location=None,
+        tools=""
+    )
+
+    distribution_chart.vbar(
+        x='Bin',
+        top='Count',
+        width=0.9,
+        source=DistributionSource,
+        legend_label="Records",
+        color=PRIMARY_COLOR
+    )
+
+    # Add Hover Tool to Distribution Chart
+    hover_distribution = HoverTool(tooltips=[
+        ("Amount", "@Bin"),
+        ("Records", "@Count")
+    ], mode='vline')
+
+    distribution_chart.add_tools(hover_distribution)
+
+    # Style the Distribution Chart
+    distribution_chart.xgrid.grid_line_color = None
+    distribution_chart.y_range.start = 0
+    distribution_chart.legend.location = "top_right"
+    distribution_chart.xaxis.axis_label = "Amount (£)"
+    distribution_chart.yaxis.axis_label = "Records"
+    distribution_chart.xaxis.major_label_orientation = 1.0
+
+    # Quantiles estimated from the merged sketches
+    DistributionQuantileDiv = Div(
+        text=" | ".join(
+            f"<b>{label}:</b> £{value:,.0f}"
+            for label, value in zip(DISTRIBUTION_QUANTILE_LABELS, DistributionQuantiles[initial_distribution])
+        ),
+        styles=footer_div_style,
+        width=1000
+    )
+
+    # Swap in the precomputed histogram and quantiles for the selected Supplier and Expense Area
+    DistributionCallback = CustomJS(
+        args=dict(
+            source=DistributionSource,
+            quantile_div=DistributionQuantileDiv,
+            supplier_select=DistributionSupplierSelect,
+            expense_area_select=DistributionExpenseAreaSelect,
+            keys=DistributionKeys,
+            counts=DistributionCounts,
+            quantiles=DistributionQuantiles,
+            quantile_labels=DISTRIBUTION_QUANTILE_LABELS
+        ),
+        code="""
+        const index = keys.indexOf(supplier_select.value + '|' + expense_area_select.value);
+        const bins = source.data['Bin'];
+
+        if (index < 0) {
+            source.data = {Bin: bins, Count: new Array(bins.length).fill(0)};
+            quantile_div.text = 'No records for this Supplier and Expense Area.';
+            return;
+        }
+
+        source.data = {Bin: bins, Count: counts[index]};
+        quantile_div.text = quantile_labels.map((label, q) =>
+            '<b>' + label + ':</b> £' + Math.round(quantiles[index][q]).toLocaleString('en-GB')
+        ).join(' | ');
+        """
+    )
+    DistributionSupplierSelect.js_on_change('value', DistributionCallback)
+    DistributionExpenseAreaSelect.js_on_change('value', DistributionCallback)
+
+    distribution_layout = column(
+        row(DistributionSupplierSelect, DistributionExpenseAreaSelect),
+        distribution_chart,
+        DistributionQuantileDiv
+    )
+
     # Arrange Graphs in a Column with Stretching
     graphs_layout = column(
         bar_chart,
         line_chart,
+        distribution_layout,
         sizing_mode='stretch_both'
     )
 
@@ -770,7 +1898,12 @@ except Exception as e:
 
 try:
     print("Rendering dashboard...")
-    show(tabs, theme=custom_theme)
+    if SERVER_MODE:
+        # custom_theme holds CSS-style attrs that Bokeh models reject, so it is left off the served document
+        curdoc().add_root(tabs)
+        curdoc().title = 'Dashboard'
+    else:
+        show(tabs, theme=custom_theme)
     print("Dashboard rendered successfully.")
 except Exception as e:
     print(f"Error rendering dashboard: {e}")